@@ -1,22 +1,111 @@
-from typing import Iterable, Literal, Optional, Type
+import os
+import stat
+import textwrap
+from collections import defaultdict
+from functools import lru_cache
+from typing import Iterable, Literal, NamedTuple, Optional, Type
 
-import mediafile
-from beets import dbcore, library, plugins, ui
+from beets import config, dbcore, library, plugins, ui
 from beets.plugins import BeetsPlugin
 from beets.ui import Subcommand, UserError, decargs, print_
+from beets.util import as_string, functemplate
 
-try:
-    # Old beets <2.6
-    from beets.ui.commands import _do_query as do_query
-    from beets.ui.commands import print_and_modify
-except ImportError:
-    from beets.ui.commands.utils import do_query
-    from beets.ui.commands.modify import print_and_modify
-
-from beets.util import functemplate
+# The plugin is loaded by every beet command, so the modules only needed by its
+# own commands (json, multiprocessing, socketserver, beets.ui.commands...) are
+# imported when they run.
 
 SearchTuple = tuple[str, Type[dbcore.query.FieldQuery]]
 
+# Maximum number of memoized matches, shared by all the query classes
+MATCH_CACHE_SIZE = 2**16
+
+# Objects checked and stored per transaction in optimistic mode
+OPTIMISTIC_BATCH_SIZE = 100
+OPTIMISTIC_RETRIES = 3
+
+# Ids sent per SQL statement, below the SQLite variables and depth limits
+FETCH_BATCH_SIZE = 500
+
+# Shards by worker process, to balance their load
+SHARDS_PER_WORKER = 4
+
+# State of a worker process computing shards
+shard_worker: dict = {}
+
+
+class ObjectChange(NamedTuple):
+    """
+    Changes applied in memory on ``obj``. ``original`` is its copy before them and
+    ``projected`` tells if only some fields were loaded. ``read`` holds the other
+    fields the new values were computed from, None if they can not be known.
+    """
+
+    obj: library.LibModel
+    original: library.LibModel
+    mods: dict
+    dels: list[str]
+    projected: bool
+    read: Optional[frozenset[str]] = frozenset()
+
+
+class LazySubcommand(Subcommand):
+    """
+    Subcommand whose options are only added by ``setup`` when it is parsed or its
+    help printed. ``beet`` creates the commands of all the plugins on each run.
+    """
+
+    def __init__(self, name, setup, **kwargs):
+        self.setup = setup
+        super().__init__(name, **kwargs)
+
+    @property
+    def parser(self):
+        if self.setup is not None:
+            setup, self.setup = self.setup, None
+            setup(self._parser)
+        return self._parser
+
+    @parser.setter
+    def parser(self, parser):
+        self._parser = parser
+
+    @property
+    def root_parser(self):
+        return self._root_parser
+
+    @root_parser.setter
+    def root_parser(self, root_parser):
+        # Like Subcommand without setting up the options
+        self._root_parser = root_parser
+        self._parser.prog = f"{as_string(root_parser.get_prog_name())} {self.name}"
+
+
+def do_query(lib, query, album, also_items=True):
+    try:
+        # Old beets <2.6
+        from beets.ui.commands import _do_query
+    except ImportError:
+        from beets.ui.commands.utils import do_query as _do_query
+
+    return _do_query(lib, query, album, also_items)
+
+
+def init_shard_worker(plugin, lib_path, lib_directory, task: tuple):
+    """
+    Open a connection of the worker process. The one of the parent must not be
+    used after the fork.
+    """
+    shard_worker["plugin"] = plugin
+    shard_worker["lib"] = library.Library(lib_path, lib_directory)
+    shard_worker["task"] = task
+
+
+def run_shard(id_range: tuple[int, int]) -> list[tuple[int, dict, dict]]:
+    return shard_worker["plugin"].compute_shard(
+        shard_worker["lib"], id_range, *shard_worker["task"]
+    )
+
+
 example_usage = """
 Examples:
 beet multimodify grouping+="Kid" <query>
@@ -33,6 +122,25 @@ beet mm 'grouping-=:Video.+' grouping+=Kid <query>
 """
 
 
+@lru_cache(maxsize=MATCH_CACHE_SIZE)
+def cached_value_match(query_class: Type[dbcore.query.FieldQuery], pattern, value):
+    """
+    Memoized ``query_class.value_match``. Queries from plugins may normalize both
+    the pattern and the value on each comparison (e.g. bareasc transliterates
+    them), while the same values come back for most objects.
+    """
+    return query_class.value_match(pattern, value)
+
+
+@lru_cache(maxsize=MATCH_CACHE_SIZE)
+def cached_match_pattern(query_class: Type[dbcore.query.FieldQuery], pattern: str):
+    """
+    Memoized conversion of a str ``pattern`` to the one expected by
+    ``query_class.value_match``. Necessary to support regex.
+    """
+    return query_class(pattern=pattern, field_name="").pattern
+
+
 class MultiValuePlugin(BeetsPlugin):
     """
     Add a modify command with add/remove values in multivalue fields
@@ -50,9 +158,26 @@ class MultiValuePlugin(BeetsPlugin):
         "genres",
     }
 
+    # Template functions only transforming their arguments. Any other function
+    # (%aunique, %ifdef, plugin ones...) may read fields of the whole object.
+    PURE_TEMPLATE_FUNCTIONS = {
+        "lower",
+        "upper",
+        "capitalize",
+        "title",
+        "left",
+        "right",
+        "if",
+        "asciify",
+        "time",
+        "first",
+    }
+
     def __init__(self):
         super().__init__()
-        self.config.add({"string_fields": {}, "fix_media_fields": False})
+        self.config.add(
+            {"string_fields": {}, "fix_media_fields": False, "socket": ""}
+        )
         self.init_fix_media_field()
 
     @property
@@ -68,49 +193,60 @@ class MultiValuePlugin(BeetsPlugin):
         return prefixes
 
     def commands(self):
-        return [self.get_command()]
+        return [
+            self.get_command(),
+            self.get_serve_command(),
+            self.get_export_command(),
+            self.get_import_command(),
+        ]
 
     def get_command(self) -> Subcommand:
-        multi_command = Subcommand(
+        multi_command = LazySubcommand(
             "multimodify",
+            self.setup_command_parser,
             help="modify command with add/remove in multi-value tags",
             aliases=("mmod", "mm"),
         )
-        multi_command.parser.usage += example_usage
-        multi_command.parser.add_option(
+        multi_command.func = self.multi
+
+        return multi_command
+
+    def setup_command_parser(self, parser):
+        parser.usage += example_usage
+        parser.add_option(
             "-m",
             "--move",
             action="store_true",
             dest="move",
             help="move files in the library directory",
         )
-        multi_command.parser.add_option(
+        parser.add_option(
             "-M",
             "--nomove",
             action="store_false",
             dest="move",
             help="don't move files in library",
         )
-        multi_command.parser.add_option(
+        parser.add_option(
             "-w",
             "--write",
             action="store_true",
             default=None,
             help="write new metadata to files' tags (default)",
         )
-        multi_command.parser.add_option(
+        parser.add_option(
             "-W",
             "--nowrite",
             action="store_false",
             dest="write",
             help="don't write metadata (opposite of -w)",
         )
-        multi_command.parser.add_album_option()
-        multi_command.parser.add_format_option(target="item")
-        multi_command.parser.add_option(
+        parser.add_album_option()
+        parser.add_format_option(target="item")
+        parser.add_option(
             "-y", "--yes", action="store_true", help="skip confirmation"
         )
-        multi_command.parser.add_option(
+        parser.add_option(
             "-I",
             "--noinherit",
             action="store_false",
@@ -118,16 +254,38 @@ class MultiValuePlugin(BeetsPlugin):
             default=True,
             help="when modifying albums, don't also change item data",
         )
-
-        multi_command.func = self.multi
-
-        return multi_command
+        parser.add_option(
+            "-l",
+            "--lazy",
+            action="store_true",
+            default=False,
+            help="only load the fields needed by the modifications",
+        )
+        parser.add_option(
+            "-O",
+            "--optimistic",
+            action="store_true",
+            default=False,
+            help="store by short batches, checking that the values did not change",
+        )
+        parser.add_option(
+            "-j",
+            "--workers",
+            type="int",
+            default=1,
+            help="number of processes computing the new values",
+        )
 
     def parse_key_val(
-        self, value: str, action: Literal["+", "-"]
+        self,
+        value: str,
+        action: Literal["+", "-"],
+        prefixes: Optional[dict[str, Type[dbcore.query.FieldQuery]]] = None,
     ) -> Optional[tuple[str, str, Type[dbcore.query.FieldQuery]]]:
         """
         Check if the value is doing an add or remove.
+
+        ``prefixes`` avoids to resolve the plugin queries again for each value.
         """
         full_action = f"{action}="
         if full_action not in value:
@@ -138,35 +296,58 @@ class MultiValuePlugin(BeetsPlugin):
         if ":" in key:
             return None
 
-        if (
-            key not in self.string_multivalue_fields
-            and key not in self.REAL_MULTIVALUE_FIELDS
-        ):
-            raise UserError(f"'{key}' is not a declared multivalue field")
+        if prefixes is None:
+            prefixes = self.get_prefixes()
 
-        for pre, query_class in self.get_prefixes().items():
+        # Exact match by default
+        query_class: Type[dbcore.query.FieldQuery] = dbcore.query.MatchQuery
+        for pre, prefix_query_class in prefixes.items():
             if val.startswith(pre):
-                if action == "+" and issubclass(query_class, dbcore.query.RegexpQuery):
-                    raise UserError("Regex is not supported when adding a value")
-                return key, val[len(pre) :], query_class
+                val = val[len(pre) :]
+                query_class = prefix_query_class
+                break
 
-        # Exact match by default
-        return (key, val, dbcore.query.MatchQuery)
+        self.check_operation(key, action, query_class)
+        return key, val, query_class
 
-    def parse_args(self, args) -> tuple[list, dict, list, list, list]:
+    def check_multivalue_fields(self, fields: Iterable[str]):
+        for field in fields:
+            if (
+                field not in self.string_multivalue_fields
+                and field not in self.REAL_MULTIVALUE_FIELDS
+            ):
+                raise UserError(f"'{field}' is not a declared multivalue field")
+
+    def check_operation(
+        self,
+        key: str,
+        action: Literal["+", "-"],
+        query_class: Type[dbcore.query.FieldQuery],
+    ):
+        """
+        Raise a UserError if the add or remove can not be applied.
+        """
+        self.check_multivalue_fields([key])
+
+        if action == "+" and issubclass(query_class, dbcore.query.RegexpQuery):
+            raise UserError("Regex is not supported when adding a value")
+
+    def parse_args(self, args, prefixes=None) -> tuple[list, dict, list, list, list]:
         query = []
         mods = {}
         dels = []
         adds = []
         removes = []
+        if prefixes is None:
+            prefixes = self.get_prefixes()
         for arg in args:
 
-            added_action = self.parse_key_val(arg, "+")
+            added_action = self.parse_key_val(arg, "+", prefixes)
             if added_action:
                 adds.append(added_action)
                 continue
 
-            removed_action = self.parse_key_val(arg, "-")
+            removed_action = self.parse_key_val(arg, "-", prefixes)
             if removed_action:
                 removes.append(removed_action)
                 continue
@@ -201,19 +382,18 @@ class MultiValuePlugin(BeetsPlugin):
         # 2/ Remove
         for pattern, query in removes:
             # Necessary to support regex. Convert the str to a regex.
-            pattern = query(pattern=pattern, field_name="").pattern
+            pattern = cached_match_pattern(query, pattern)
             multi_values = [
-                value for value in multi_values if not query.value_match(pattern, value)
+                value
+                for value in multi_values
+                if not cached_value_match(query, pattern, value)
             ]
 
         # 3/ Add
         for pattern, query in adds:
-            is_matching = False
-            for value in multi_values:
-                if query.value_match(pattern, value):
-                    is_matching = True
-
-            if not is_matching:
+            if not any(
+                cached_value_match(query, pattern, value) for value in multi_values
+            ):
                 multi_values.append(pattern)
 
         return separator.join(multi_values)
@@ -239,29 +419,80 @@ class MultiValuePlugin(BeetsPlugin):
 
         # 2/ Remove
         for pattern, query in removes:
-            pattern = query(pattern=pattern, field_name="").pattern
+            pattern = cached_match_pattern(query, pattern)
             multi_values = [
-                value for value in multi_values if not query.value_match(pattern, value)
+                value
+                for value in multi_values
+                if not cached_value_match(query, pattern, value)
             ]
 
         # 3/ Add
         for pattern, query in adds:
-            is_matching = False
-            for value in multi_values:
-                if query.value_match(pattern, value):
-                    is_matching = True
-
-            if not is_matching:
+            if not any(
+                cached_value_match(query, pattern, value) for value in multi_values
+            ):
                 multi_values.append(pattern)
 
         return multi_values
 
+    def update_string_multivalues(
+        self,
+        values: Iterable[str],
+        assignment: Optional[str],
+        adds: Iterable[SearchTuple],
+        removes: Iterable[SearchTuple],
+        separator: str,
+    ) -> list[str]:
+        """
+        Bulk ``update_string_multivalue``: apply the same changes to each of
+        ``values``. Identical values are only computed once.
+        """
+        values, adds, removes = list(values), list(adds), list(removes)
+        results: dict[str, str] = {}
+        for value in values:
+            if value not in results:
+                results[value] = self.update_string_multivalue(
+                    value, assignment, adds, removes, separator
+                )
+        return [results[value] for value in values]
+
+    def update_list_multivalues(
+        self,
+        values_list: Iterable[list[str]],
+        assignment: Optional[str],
+        adds: Iterable[SearchTuple],
+        removes: Iterable[SearchTuple],
+    ) -> list[list[str]]:
+        """
+        Bulk ``update_list_multivalue``: apply the same changes to each of
+        ``values_list``. Identical lists are only computed once.
+        """
+        adds, removes = list(adds), list(removes)
+        results: dict[tuple[str, ...], list[str]] = {}
+        outputs = []
+        for values in values_list:
+            key = tuple(values)
+            if key not in results:
+                results[key] = self.update_list_multivalue(
+                    values, assignment, adds, removes
+                )
+            outputs.append(results[key].copy())
+        return outputs
+
     def evaluate_value_template(self, obj, value: Optional[str]) -> Optional[str]:
         return obj.evaluate_template(value) if value is not None else None
 
     def evaluate_iter_template(self, obj, values: Iterable[SearchTuple]):
         return [(obj.evaluate_template(a), query) for a, query in values]
 
+    def get_template_literal(self, template: functemplate.Template) -> Optional[str]:
+        """
+        Return the text of ``template`` if it does not depend on the object.
+        """
+        if all(isinstance(part, str) for part in template.expr.parts):
+            return "".join(template.expr.parts)
+        return None
+
     def get_default_template(self) -> dict:
         return {
             "set": None,
@@ -269,6 +500,653 @@ class MultiValuePlugin(BeetsPlugin):
             "removes": [],
         }
 
+    def get_templates(self, mods: dict, adds, removes) -> dict:
+        """
+        Group the operations by field and compile their values as templates.
+        """
+        templates: dict[str, dict] = {}
+        for key, value, query_class in adds:
+            if key not in templates:
+                templates[key] = self.get_default_template()
+            templates[key]["adds"].append((functemplate.template(value), query_class))
+
+        for key, value, query_class in removes:
+            if key not in templates:
+                templates[key] = self.get_default_template()
+            templates[key]["removes"].append(
+                (functemplate.template(value), query_class)
+            )
+
+        for key, value in mods.items():
+            if key not in templates:
+                templates[key] = self.get_default_template()
+            templates[key]["set"] = functemplate.template(value)
+
+        return templates
+
+    def get_literal_template(self, template: dict) -> Optional[dict]:
+        """
+        Evaluated operations of a field if none of them depends on the object.
+        """
+        literal = self.get_default_template()
+        if template["set"] is not None:
+            literal["set"] = self.get_template_literal(template["set"])
+            if literal["set"] is None:
+                return None
+
+        for action in ("adds", "removes"):
+            for value, query_class in template[action]:
+                text = self.get_template_literal(value)
+                if text is None:
+                    return None
+                literal[action].append((text, query_class))
+
+        return literal
+
+    def compute_objs_mods(self, model_cls, objs: list, templates: dict) -> list[dict]:
+        """
+        New values of the fields in ``templates`` for each of ``objs``. Fields whose
+        operations are the same for all the objects go through the bulk engines.
+        """
+        objs_mods: list[dict] = [{} for _ in objs]
+        for key, template in templates.items():
+            literal = self.get_literal_template(template)
+
+            if literal is not None and key in self.string_multivalue_fields:
+                new_values = self.update_string_multivalues(
+                    [obj.get(key, "") for obj in objs],
+                    literal["set"],
+                    literal["adds"],
+                    literal["removes"],
+                    self.string_multivalue_fields[key],
+                )
+                for obj_mods, new_value in zip(objs_mods, new_values):
+                    obj_mods[key] = model_cls._parse(key, new_value)
+            elif literal is not None and key in self.REAL_MULTIVALUE_FIELDS:
+                new_lists = self.update_list_multivalues(
+                    [obj.get(key, []) for obj in objs],
+                    literal["set"],
+                    literal["adds"],
+                    literal["removes"],
+                )
+                for obj_mods, new_list in zip(objs_mods, new_lists):
+                    obj_mods[key] = new_list
+            elif literal is not None:
+                new_value = model_cls._parse(key, literal["set"])
+                for obj_mods in objs_mods:
+                    obj_mods[key] = new_value
+            else:
+                for obj, obj_mods in zip(objs, objs_mods):
+                    obj_mods[key] = self.compute_obj_value(
+                        model_cls, obj, key, template
+                    )
+
+        return objs_mods
+
+    def compute_obj_value(self, model_cls, obj, key: str, template: dict):
+        if key in self.string_multivalue_fields:
+            return model_cls._parse(
+                key,
+                self.update_string_multivalue(
+                    obj.get(key, ""),
+                    self.evaluate_value_template(obj, template["set"]),
+                    self.evaluate_iter_template(obj, template["adds"]),
+                    self.evaluate_iter_template(obj, template["removes"]),
+                    self.string_multivalue_fields[key],
+                ),
+            )
+        elif key in self.REAL_MULTIVALUE_FIELDS:
+            return self.update_list_multivalue(
+                obj.get(key, []),
+                self.evaluate_value_template(obj, template["set"]),
+                self.evaluate_iter_template(obj, template["adds"]),
+                self.evaluate_iter_template(obj, template["removes"]),
+            )
+        else:
+            return model_cls._parse(key, obj.evaluate_template(template["set"]))
+
+    ##
+    # Projection loading
+    ##
+
+    def get_template_fields(
+        self, templates: Iterable[functemplate.Template]
+    ) -> Optional[set[str]]:
+        """
+        Collect the fields read by ``templates``. Return None if a template calls
+        a function that may read any other field.
+        """
+        fields = set()
+        for template in templates:
+            _, varnames, funcnames = template.expr.translate()
+            if not funcnames <= self.PURE_TEMPLATE_FUNCTIONS:
+                return None
+            fields |= varnames
+
+        # `artist` and `albumartist` fall back to one another when formatted.
+        if fields & {"artist", "albumartist"}:
+            fields |= {"artist", "albumartist"}
+        return fields
+
+    def get_value_templates(self, templates: dict) -> list[functemplate.Template]:
+        value_templates = []
+        for template in templates.values():
+            if template["set"] is not None:
+                value_templates.append(template["set"])
+            value_templates += [t for t, _ in template["adds"]]
+            value_templates += [t for t, _ in template["removes"]]
+        return value_templates
+
+    def get_query_fields(self, query, model_cls) -> set[str]:
+        query_obj, _ = self.parse_query(query, model_cls)
+        try:
+            return query_obj.field_names
+        except TypeError:
+            # Collection query without subquery
+            return set()
+
+    def get_needed_fields(
+        self, model_cls, templates: dict, dels, query=None
+    ) -> Optional[set[str]]:
+        """
+        Fields to load so that the modifications, their preview and the check of
+        the ``query`` fields are identical to the ones on a complete object. None
+        if they can not be known.
+        """
+        used_templates = [
+            functemplate.template(config[model_cls._format_config_key].as_str()),
+            *self.get_value_templates(templates),
+        ]
+
+        fields = self.get_template_fields(used_templates)
+        if fields is None:
+            return None
+        return (
+            fields
+            | set(templates)
+            | set(dels)
+            | self.get_query_fields(query, model_cls)
+        )
+
+    def get_read_fields(
+        self, model_cls, templates: dict, query=None
+    ) -> Optional[frozenset[str]]:
+        """
+        Fields the new values are computed from and the ones matched by ``query``,
+        besides the modified ones. None if they can not be known or are computed.
+        """
+        fields = self.get_template_fields(self.get_value_templates(templates))
+        if fields is None:
+            return None
+
+        fields |= self.get_query_fields(query, model_cls)
+        if fields & set(model_cls._getters()):
+            return None
+        return frozenset(fields)
+
+    def parse_query(self, query, model_cls) -> tuple[dbcore.Query, dbcore.query.Sort]:
+        """
+        Parse ``query`` as the library does. It may already be a Query object.
+        """
+        try:
+            if isinstance(query, str):
+                return library.parse_query_string(query, model_cls)
+            elif isinstance(query, (list, tuple)):
+                return library.parse_query_parts(query, model_cls)
+        except dbcore.query.InvalidQueryArgumentValueError as exc:
+            raise dbcore.InvalidQueryError(query, exc)
+        return query or dbcore.query.TrueQuery(), dbcore.query.NullSort()
+
+    def do_projected_query(self, lib, query, album, fields: set[str]) -> Optional[list]:
+        """
+        Like ``do_query`` but the objects only hold ``fields``. Return None when
+        the query or the fields require complete objects.
+        """
+        model_cls = library.Album if album else library.Item
+        if fields & set(model_cls._getters()):
+            return None
+
+        query_obj, sort = self.parse_query(query, model_cls)
+        if isinstance(sort, dbcore.query.NullSort):
+            sort = (
+                lib.get_default_album_sort() if album else lib.get_default_item_sort()
+            )
+
+        ids_clause = self.get_ids_sql(model_cls, query_obj)
+        if ids_clause is None or sort.is_slow():
+            return None
+        ids_sql, subvals = ids_clause
+
+        objs = self.fetch_fields(
+            lib, model_cls, ids_sql, subvals, fields, sort.order_clause()
+        )
+
+        if album and not objs:
+            raise UserError("No matching albums found.")
+        elif not album and not objs:
+            raise UserError("No matching items found.")
+
+        return objs
+
+    def get_ids_sql(self, model_cls, query_obj) -> Optional[tuple[str, list]]:
+        """
+        SQL selecting the ids matching ``query_obj`` and its values. None if the
+        query can not run in SQL.
+        """
+        where, subvals = query_obj.clause()
+        if where is None:
+            return None
+
+        table = model_cls._table
+        _from = table
+        if getattr(query_obj, "field_names", set()) & getattr(
+            model_cls, "other_db_fields", set()
+        ):
+            _from += f" {model_cls.relation_join}"
+        return f"SELECT {table}.id FROM ({_from}) WHERE {where}", list(subvals)
+
+    def fetch_fields(
+        self, lib, model_cls, ids_sql: str, subvals, fields: set[str], order_by=None
+    ) -> list:
+        """
+        Objects whose id is returned by ``ids_sql`` holding only ``fields``.
+        """
+        table = model_cls._table
+        columns = {"id"} | (fields & set(model_cls._fields))
+        if model_cls is library.Item:
+            # Required to fall back on the album values
+            columns.add("album_id")
+        sql = f"SELECT {', '.join(sorted(columns))} FROM {table} WHERE id IN ({ids_sql})"
+        if order_by:
+            sql += f" ORDER BY {order_by}"
+
+        flex_keys = sorted(fields - set(model_cls._fields))
+        flex_sql = (
+            f"SELECT entity_id, key, value FROM {model_cls._flex_table} "
+            f"WHERE key IN ({', '.join('?' * len(flex_keys))}) "
+            f"AND entity_id IN ({ids_sql})"
+        )
+
+        with lib.transaction() as tx:
+            rows = tx.query(sql, subvals)
+            flex_rows = tx.query(flex_sql, [*flex_keys, *subvals]) if flex_keys else []
+
+        flex_values: dict = defaultdict(dict)
+        for row in flex_rows:
+            flex_values[row["entity_id"]][row["key"]] = row["value"]
+
+        return [
+            model_cls._awaken(lib, dict(row), flex_values[row["id"]]) for row in rows
+        ]
+
+    def load_full_object(self, lib, change: ObjectChange):
+        """
+        Reload all the fields of a projected object and re-apply the changes.
+        """
+        if isinstance(change.obj, library.Album):
+            full_obj = lib.get_album(change.obj.id)
+        else:
+            full_obj = lib.get_item(change.obj.id)
+        self.apply_modifications(full_obj, change.mods, change.dels)
+        return full_obj
+
+    ##
+    # Batch API
+    ##
+
+    def apply_modifications(self, obj, mods, dels):
+        obj.update(mods)
+        for field in dels:
+            try:
+                del obj[field]
+            except KeyError:
+                pass
+
+    def query_objects(
+        self, lib, query, album, templates: dict, dels, lazy
+    ) -> tuple[list, bool]:
+        """
+        Objects matching ``query`` and whether they were projected.
+        """
+        if lazy:
+            model_cls = library.Album if album else library.Item
+            fields = self.get_needed_fields(model_cls, templates, dels, query)
+            if fields is not None:
+                objs = self.do_projected_query(lib, query, album, fields)
+                if objs is not None:
+                    return objs, True
+
+        items, albums = do_query(lib, query, album, False)
+        return (albums if album else items), False
+
+    def compute_changes(
+        self,
+        lib,
+        query=None,
+        mods: Optional[dict] = None,
+        dels: Iterable[str] = (),
+        adds: Iterable[tuple[str, str, Type[dbcore.query.FieldQuery]]] = (),
+        removes: Iterable[tuple[str, str, Type[dbcore.query.FieldQuery]]] = (),
+        album=False,
+        lazy=False,
+        show=False,
+        workers=1,
+    ) -> list[ObjectChange]:
+        """
+        Compute the changes on the objects matching ``query`` without storing them.
+
+        ``adds`` and ``removes`` are ``(field, value, query_class)`` tuples, ``mods``
+        maps fields to their new value and ``dels`` lists the fields to delete. The
+        values are templates evaluated for each object. Only the changed objects are
+        returned, ``apply_changes`` stores them.
+
+        With ``show``, the number of objects and the diff of each change are printed.
+        With more than one of ``workers``, the new values are computed in parallel
+        processes.
+        """
+        mods = mods or {}
+        dels = list(dels)
+        adds = list(adds)
+        removes = list(removes)
+        for key, _, query_class in adds:
+            self.check_operation(key, "+", query_class)
+        for key, _, query_class in removes:
+            self.check_operation(key, "-", query_class)
+
+        if workers > 1:
+            import multiprocessing
+
+            if lib.path == ":memory:":
+                self._log.warning("workers can not share an in-memory library")
+            elif "fork" not in multiprocessing.get_all_start_methods():
+                self._log.warning("workers require the fork start method")
+            else:
+                return self.compute_parallel_changes(
+                    lib, query, mods, dels, adds, removes, album, workers, show
+                )
+
+        model_cls = library.Album if album else library.Item
+        templates = self.get_templates(mods, adds, removes)
+        objs, projected = self.query_objects(lib, query, album, templates, dels, lazy)
+
+        if show:
+            print_(
+                "Modifying {} {}s.".format(len(objs), "album" if album else "item")
+            )
+
+        return self.collect_changes(
+            objs,
+            self.compute_objs_mods(model_cls, objs, templates),
+            dels,
+            projected,
+            show,
+            self.get_read_fields(model_cls, templates, query),
+        )
+
+    def collect_changes(
+        self,
+        objs: list,
+        objs_mods: list[dict],
+        dels,
+        projected,
+        show=False,
+        read: Optional[frozenset[str]] = frozenset(),
+    ) -> list[ObjectChange]:
+        # Apply changes *temporarily*, preview them, and collect modified
+        # objects.
+        changes = []
+        for obj, obj_mods in zip(objs, objs_mods):
+            original = obj.copy()
+            self.apply_modifications(obj, obj_mods, dels)
+            change = ObjectChange(obj, original, obj_mods, dels, projected, read)
+            if self.show_change(change) if show else self.has_changes(change):
+                changes.append(change)
+
+        return changes
+
+    def has_changes(self, change: ObjectChange) -> bool:
+        return any(
+            change.original.get(field) != change.obj.get(field)
+            for field in (*change.mods, *change.dels)
+        )
+
+    def show_change(self, change: ObjectChange) -> bool:
+        """
+        Print the diff of ``change`` and return whether there is one. Multi-value
+        fields only show their added and removed elements.
+        """
+        fields = {*change.mods, *change.dels}
+        multivalue_fields = {
+            field
+            for field in fields
+            if field in self.string_multivalue_fields
+            or field in self.REAL_MULTIVALUE_FIELDS
+        }
+
+        lines = []
+        for field in sorted(multivalue_fields):
+            line = self.get_multivalue_diff(
+                field, change.original.get(field), change.obj.get(field)
+            )
+            if line:
+                lines.append(line)
+
+        # Prints the object for the other fields
+        other_fields = fields - multivalue_fields
+        changed = bool(other_fields) and ui.show_model_changes(
+            change.obj, change.original, other_fields
+        )
+        if lines:
+            if not changed:
+                print_(format(change.original))
+            print_(textwrap.indent("\n".join(lines), "  "))
+
+        return changed or bool(lines)
+
+    def get_multivalue_diff(self, field: str, old, new) -> Optional[str]:
+        """
+        Diff of the elements of a multi-value field, linear in their number. None
+        if the value did not change.
+        """
+        old_values = self.split_multivalue(field, old)
+        new_values = self.split_multivalue(field, new)
+        if old_values == new_values:
+            return None
+
+        old_set, new_set = set(old_values), set(new_values)
+        removed = [value for value in dict.fromkeys(old_values) if value not in new_set]
+        added = [value for value in dict.fromkeys(new_values) if value not in old_set]
+        if not removed and not added:
+            # Only the order or the duplicates changed
+            return f"{field}: {'; '.join(old_values)} -> {'; '.join(new_values)}"
+
+        return "\n".join(
+            [
+                f"{field}:",
+                *(ui.colorize("text_diff_removed", f"  - {value}") for value in removed),
+                *(ui.colorize("text_diff_added", f"  + {value}") for value in added),
+            ]
+        )
+
+    def apply_changes(
+        self,
+        lib,
+        changes: Iterable[ObjectChange],
+        write=False,
+        move=False,
+        inherit=True,
+        batch_size: Optional[int] = None,
+        check=False,
+    ) -> list[ObjectChange]:
+        """
+        Store ``changes`` to the database, optionally writing and moving the files.
+
+        Each batch of ``batch_size`` objects is stored in its own transaction. By
+        default, a single transaction is used.
+
+        With ``check``, the changed fields of each batch are compared with their
+        current value in the database first (compare-and-set). The changes of the
+        objects modified since they were read are not applied and returned.
+        """
+        changes = list(changes)
+        batch_size = batch_size or len(changes) or 1
+        conflicts = []
+        for start in range(0, len(changes), batch_size):
+            batch = changes[start : start + batch_size]
+            with lib.transaction() as tx:
+                batch_conflicts = self.get_conflicts(lib, tx, batch) if check else []
+                conflicts += batch_conflicts
+                for change in batch:
+                    if change in batch_conflicts:
+                        continue
+                    obj = change.obj
+                    if (change.projected or check) and (write or move):
+                        # Writing and moving use all the fields, with their
+                        # current value.
+                        obj = self.load_full_object(lib, change)
+                    obj.try_sync(write, move, inherit)
+
+        return conflicts
+
+    def get_checked_fields(self, change: ObjectChange) -> Optional[set[str]]:
+        """
+        Fields whose values ``change`` depends on. None if they can not be known.
+        """
+        if change.read is None:
+            return None
+        return {*change.mods, *change.dels, *change.read}
+
+    def get_conflicts(self, lib, tx, changes: list[ObjectChange]) -> list[ObjectChange]:
+        """
+        Changes whose modified or read fields changed in the database since their
+        object was read. When the read fields are unknown, all the fields are
+        compared. The write lock is held until the end of ``tx``.
+        """
+        if not changes:
+            return []
+
+        model_cls = type(changes[0].obj)
+        # Any UPDATE takes the SQLite write lock, even without matching row. No
+        # other connection can change the checked values before the commit.
+        tx.mutate(f"UPDATE {model_cls._table} SET id = id WHERE 0")
+
+        checked = {change.obj.id: self.get_checked_fields(change) for change in changes}
+        ids = [obj_id for obj_id, fields in checked.items() if fields is not None]
+        all_fields = set().union(*(fields for fields in checked.values() if fields))
+        placeholders = ", ".join("?" * len(ids))
+        ids_sql = f"SELECT id FROM {model_cls._table} WHERE id IN ({placeholders})"
+        current = {
+            obj.id: obj
+            for obj in self.fetch_fields(lib, model_cls, ids_sql, ids, all_fields)
+        }
+        for obj_id in checked.keys() - set(ids):
+            full_obj = (
+                lib.get_album(obj_id)
+                if model_cls is library.Album
+                else lib.get_item(obj_id)
+            )
+            if full_obj is not None:
+                current[obj_id] = full_obj
+
+        conflicts = []
+        for change in changes:
+            obj = current.get(change.obj.id)
+            if obj is None:
+                # Removed meanwhile
+                conflicts.append(change)
+                continue
+            fields = checked[change.obj.id] or {*change.original.keys(), *obj.keys()}
+            if any(obj.get(field) != change.original.get(field) for field in fields):
+                conflicts.append(change)
+
+        return conflicts
+
+    def get_ids_query(self, query, model_cls, ids: list[int]) -> dbcore.Query:
+        """
+        Restrict ``query`` to the objects with ``ids``.
+        """
+        query_obj, _ = self.parse_query(query, model_cls)
+        return dbcore.query.AndQuery(
+            [
+                query_obj,
+                dbcore.query.OrQuery(
+                    [
+                        dbcore.query.MatchQuery(f"{model_cls._table}.id", obj_id)
+                        for obj_id in ids
+                    ]
+                ),
+            ]
+        )
+
+    def apply_optimistic_changes(
+        self,
+        lib,
+        changes: list[ObjectChange],
+        query,
+        mods,
+        dels,
+        adds,
+        removes,
+        write,
+        move,
+        album,
+        inherit,
+        lazy=False,
+        retries=OPTIMISTIC_RETRIES,
+        show=False,
+        confirm=False,
+    ) -> list[ObjectChange]:
+        """
+        Apply ``changes`` by short checked batches. The objects modified meanwhile
+        by another process are computed again from their new values, up to
+        ``retries`` times. With ``confirm``, the new values are only applied once
+        confirmed again. Return the changes still conflicting.
+        """
+        model_cls = library.Album if album else library.Item
+        conflicts = self.apply_changes(
+            lib, changes, write, move, inherit, OPTIMISTIC_BATCH_SIZE, check=True
+        )
+        for _ in range(retries):
+            if not conflicts:
+                break
+            if show:
+                print_(
+                    "Retrying {} {}s modified meanwhile.".format(
+                        len(conflicts), "album" if album else "item"
+                    )
+                )
+
+            ids = [change.obj.id for change in conflicts]
+            changes = []
+            # Bounded to stay under the SQLite expression depth
+            for start in range(0, len(ids), OPTIMISTIC_BATCH_SIZE):
+                ids_query = self.get_ids_query(
+                    query, model_cls, ids[start : start + OPTIMISTIC_BATCH_SIZE]
+                )
+                try:
+                    changes += self.compute_changes(
+                        lib, ids_query, mods, dels, adds, removes, album, lazy, show
+                    )
+                except UserError:
+                    # They do not match the query anymore
+                    continue
+
+            if confirm and changes:
+                changes = ui.input_select_objects(
+                    "Really modify the new values", changes, self.show_change
+                )
+            conflicts = self.apply_changes(
+                lib,
+                changes,
+                write,
+                move,
+                inherit,
+                OPTIMISTIC_BATCH_SIZE,
+                check=True,
+            )
+
+        return conflicts
+
     def modify_multi_items(
         self,
         lib,
@@ -282,6 +1160,9 @@ class MultiValuePlugin(BeetsPlugin):
         album,
         confirm,
         inherit,
+        lazy=False,
+        optimistic=False,
+        workers=1,
     ):
         """
         Manage the multi values update, mostly influenced by modify command
@@ -291,68 +1172,20 @@ class MultiValuePlugin(BeetsPlugin):
         # 2/ Remove
         # 3/ Add
         # 4/ Del
-        """
-        # Parse key=value specifications into a dictionary.
-        model_cls = library.Album if album else library.Item
-
-        # Get the items to modify.
-        items, albums = do_query(lib, query, album, False)
-        objs = albums if album else items
-
-        # Apply changes *temporarily*, preview them, and collect modified
-        # objects.
-        print_("Modifying {} {}s.".format(len(objs), "album" if album else "item"))
-        changed = []
-        changes = []
-
-        templates = {}
-        for key, value, query in adds:
-            if key not in templates:
-                templates[key] = self.get_default_template()
-            templates[key]["adds"].append((functemplate.template(value), query))
-
-        for key, value, query in removes:
-            if key not in templates:
-                templates[key] = self.get_default_template()
-            templates[key]["removes"].append((functemplate.template(value), query))
 
-        for key, value in mods.items():
-            if key not in templates:
-                templates[key] = self.get_default_template()
-            templates[key]["set"] = functemplate.template(value)
+        With ``lazy``, only the fields read by the modifications are loaded when
+        possible. Complete objects are then loaded only to write or move them.
 
-        for obj in objs:
-            obj_mods = {}
-            for key in templates.keys():
-                if key in self.string_multivalue_fields:
-                    obj_mods[key] = model_cls._parse(
-                        key,
-                        self.update_string_multivalue(
-                            obj.get(key, ""),
-                            self.evaluate_value_template(obj, templates[key]["set"]),
-                            self.evaluate_iter_template(obj, templates[key]["adds"]),
-                            self.evaluate_iter_template(obj, templates[key]["removes"]),
-                            self.string_multivalue_fields[key],
-                        ),
-                    )
-                elif key in self.REAL_MULTIVALUE_FIELDS:
-                    obj_mods[key] = self.update_list_multivalue(
-                        obj.get(key, []),
-                        self.evaluate_value_template(obj, templates[key]["set"]),
-                        self.evaluate_iter_template(obj, templates[key]["adds"]),
-                        self.evaluate_iter_template(obj, templates[key]["removes"]),
-                    )
-                else:
-                    obj_mods[key] = model_cls._parse(
-                        key, obj.evaluate_template(templates[key]["set"])
-                    )
-
-            if print_and_modify(obj, obj_mods, dels) and obj not in changed:
-                changed.append(obj)
-                changes.append(obj_mods)
+        With ``optimistic``, the changes are stored by short batches, only if the
+        values did not change since they were read. With more than one of
+        ``workers``, the new values are computed in parallel processes.
+        """
+        changes = self.compute_changes(
+            lib, query, mods, dels, adds, removes, album, lazy, True, workers
+        )
 
         # Still something to do?
-        if not changed:
+        if not changes:
             print_("No changes to make.")
             return
 
@@ -367,21 +1200,42 @@ class MultiValuePlugin(BeetsPlugin):
             else:
                 extra = ""
 
-            selected_objects = ui.input_select_objects(
-                "Really modify%s" % extra,
-                zip(changed, changes),
-                lambda o, om: print_and_modify(o, om, dels),
+            changes = ui.input_select_objects(
+                "Really modify%s" % extra, changes, self.show_change
             )
 
-            if not selected_objects:
+            if not changes:
                 return
 
-            changed, _ = zip(*selected_objects)
-
         # Apply changes to database and files
-        with lib.transaction():
-            for obj in changed:
-                obj.try_sync(write, move, inherit)
+        if not optimistic:
+            self.apply_changes(lib, changes, write, move, inherit)
+            return
+
+        conflicts = self.apply_optimistic_changes(
+            lib,
+            changes,
+            query,
+            mods,
+            dels,
+            adds,
+            removes,
+            write,
+            move,
+            album,
+            inherit,
+            lazy,
+            show=True,
+            confirm=confirm,
+        )
+        if conflicts:
+            print_(
+                "Skipped {} {}s modified meanwhile: {}".format(
+                    len(conflicts),
+                    "album" if album else "item",
+                    ", ".join(f"id:{change.obj.id}" for change in conflicts),
+                )
+            )
 
     def multi(self, lib, opts, args):
         """CLI entry"""
@@ -399,6 +1253,540 @@ class MultiValuePlugin(BeetsPlugin):
             opts.album,
             not opts.yes,
             opts.inherit,
+            opts.lazy,
+            opts.optimistic,
+            opts.workers,
+        )
+
+    ##
+    # Parallel compute
+    ##
+
+    def get_matching_ids(self, lib, query, album) -> list[int]:
+        model_cls = library.Album if album else library.Item
+        query_obj, _ = self.parse_query(query, model_cls)
+        ids_clause = self.get_ids_sql(model_cls, query_obj)
+        if ids_clause is None:
+            items, albums = do_query(lib, query, album, False)
+            return sorted(obj.id for obj in (albums if album else items))
+
+        ids_sql, subvals = ids_clause
+        with lib.transaction() as tx:
+            rows = tx.query(f"SELECT DISTINCT id FROM ({ids_sql}) ORDER BY id", subvals)
+        return [row["id"] for row in rows]
+
+    def compute_shard(
+        self, lib, id_range: tuple[int, int], query, album, mods, dels, adds, removes
+    ) -> list[tuple[int, dict, dict]]:
+        """
+        Id, new values and values they were computed from of the changed objects
+        matching ``query`` with an id in ``id_range``. Run in the worker processes.
+        """
+        model_cls = library.Album if album else library.Item
+        query_obj, _ = self.parse_query(query, model_cls)
+        range_query = dbcore.query.NumericQuery(
+            f"{model_cls._table}.id", "{}..{}".format(*id_range)
+        )
+        if self.get_ids_sql(model_cls, query_obj) is None:
+            # Restricted to the shard in SQL first, else the whole library would
+            # be matched in Python by each shard.
+            objs = [
+                obj
+                for obj in (lib.albums if album else lib.items)(range_query)
+                if query_obj.match(obj)
+            ]
+            templates = self.get_templates(mods, adds, removes)
+            changes = self.collect_changes(
+                objs,
+                self.compute_objs_mods(model_cls, objs, templates),
+                dels,
+                False,
+                read=self.get_read_fields(model_cls, templates, query),
+            )
+        else:
+            try:
+                changes = self.compute_changes(
+                    lib,
+                    dbcore.query.AndQuery([query_obj, range_query]),
+                    mods,
+                    dels,
+                    adds,
+                    removes,
+                    album,
+                    lazy=True,
+                )
+            except UserError:
+                # Removed meanwhile
+                return []
+        return [
+            (change.obj.id, change.mods, self.get_read_values(change))
+            for change in changes
+        ]
+
+    def get_read_values(self, change: ObjectChange) -> dict:
+        """
+        Values of ``change.original`` the change depends on, all of them if they
+        can not be known.
+        """
+        fields = self.get_checked_fields(change)
+        if fields is None:
+            fields = set(change.original.keys())
+        return {field: change.original.get(field) for field in fields}
+
+    def compute_parallel_changes(
+        self, lib, query, mods, dels, adds, removes, album, workers, show=False
+    ) -> list[ObjectChange]:
+        """
+        ``compute_changes`` with the matching ids sharded in ranges computed by a
+        pool of ``workers`` processes. Each process reads its objects with its own
+        connection and only sends back the id and the new values of the changed
+        ones.
+        """
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        model_cls = library.Album if album else library.Item
+        ids = self.get_matching_ids(lib, query, album)
+        if not ids:
+            raise UserError(
+                "No matching {}s found.".format("album" if album else "item")
+            )
+        if show:
+            print_("Modifying {} {}s.".format(len(ids), "album" if album else "item"))
+
+        shard_size = -(-len(ids) // (workers * SHARDS_PER_WORKER))
+        id_ranges = [
+            (ids[start], ids[min(start + shard_size, len(ids)) - 1])
+            for start in range(0, len(ids), shard_size)
+        ]
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            # The loaded plugins, template functions and query classes are
+            # inherited instead of being pickled.
+            mp_context=multiprocessing.get_context("fork"),
+            initializer=init_shard_worker,
+            initargs=(
+                self,
+                lib.path,
+                lib.directory,
+                (query, album, mods, dels, adds, removes),
+            ),
+        ) as pool:
+            results = [
+                result for shard in pool.map(run_shard, id_ranges) for result in shard
+            ]
+
+        # Only the fields to modify, display and check are needed by the writer
+        templates = self.get_templates(mods, adds, removes)
+        fields = self.get_needed_fields(model_cls, templates, dels, query)
+        objs: dict[int, library.LibModel] = {}
+        result_ids = [obj_id for obj_id, _, _ in results]
+        for start in range(0, len(result_ids), FETCH_BATCH_SIZE):
+            batch_ids = result_ids[start : start + FETCH_BATCH_SIZE]
+            if fields is None:
+                batch_objs = [
+                    lib.get_album(obj_id) if album else lib.get_item(obj_id)
+                    for obj_id in batch_ids
+                ]
+            else:
+                placeholders = ", ".join("?" * len(batch_ids))
+                ids_sql = (
+                    f"SELECT id FROM {model_cls._table} WHERE id IN ({placeholders})"
+                )
+                batch_objs = self.fetch_fields(
+                    lib, model_cls, ids_sql, batch_ids, fields
+                )
+            objs.update((obj.id, obj) for obj in batch_objs if obj is not None)
+
+        # The objects changed since a worker read them are computed again, as
+        # their new values and the diff would be based on stale values.
+        current_objs, current_mods, stale_objs = [], [], []
+        for obj_id, obj_mods, read_values in results:
+            obj = objs.get(obj_id)
+            if obj is None:
+                continue
+            if any(obj.get(field) != value for field, value in read_values.items()):
+                stale_objs.append(obj)
+            else:
+                current_objs.append(obj)
+                current_mods.append(obj_mods)
+
+        query_obj, _ = self.parse_query(query, model_cls)
+        stale_objs = [obj for obj in stale_objs if query_obj.match(obj)]
+        return self.collect_changes(
+            [*current_objs, *stale_objs],
+            [*current_mods, *self.compute_objs_mods(model_cls, stale_objs, templates)],
+            dels,
+            fields is not None,
+            show,
+            self.get_read_fields(model_cls, templates, query),
+        )
+
+    ##
+    # Server
+    ##
+
+    def get_serve_command(self) -> Subcommand:
+        serve_command = LazySubcommand(
+            "mvserve",
+            self.setup_serve_parser,
+            help="apply multimodify requests received on a Unix socket",
+        )
+        serve_command.func = self.serve
+        return serve_command
+
+    def setup_serve_parser(self, parser):
+        parser.add_option(
+            "-s",
+            "--socket",
+            dest="socket",
+            help="path of the Unix socket to listen on",
+        )
+
+    def get_socket_path(self, path: Optional[str] = None) -> str:
+        if path:
+            return os.path.expanduser(path)
+        if self.config["socket"].get():
+            return self.config["socket"].as_filename()
+        return os.path.join(config.config_dir(), "multivalue.sock")
+
+    def get_server(self, lib, path: str):
+        """
+        Unix socket server applying the requests on ``lib``. The prefix table is
+        resolved once.
+
+        Each connection is served in its own thread, so a client keeping its
+        connection open does not block the others. The requests are applied one at
+        a time: two requests on the same object would else both compute their new
+        value from the same read and the last stored would drop the other edit.
+        """
+        import json
+        import socketserver
+        import sqlite3
+        import threading
+
+        plugin = self
+        prefixes = self.get_prefixes()
+        # Held from the read of the values to their storage
+        lock = threading.Lock()
+
+        class MultiValueRequestHandler(socketserver.StreamRequestHandler):
+            """
+            Read one JSON request per line and answer each with one JSON line.
+            """
+
+            def handle(self):
+                for line in self.rfile:
+                    try:
+                        request = json.loads(line)
+                        with lock:
+                            response = plugin.serve_request(lib, request, prefixes)
+                    except (
+                        UserError,
+                        ValueError,
+                        library.FileOperationError,
+                        sqlite3.Error,
+                    ) as exc:
+                        response = {"error": str(exc)}
+                    self.wfile.write(
+                        json.dumps(response, default=str).encode() + b"\n"
+                    )
+                    self.wfile.flush()
+
+        if os.path.exists(path) and stat.S_ISSOCK(os.stat(path).st_mode):
+            # Left by a previous server
+            os.remove(path)
+
+        if lib.path == ":memory:":
+            # Each thread would open its own empty database
+            self._log.warning("requests on an in-memory library are served in turn")
+            return socketserver.UnixStreamServer(path, MultiValueRequestHandler)
+
+        server = socketserver.ThreadingUnixStreamServer(path, MultiValueRequestHandler)
+        server.daemon_threads = True
+        return server
+
+    def serve_request(self, lib, request: dict, prefixes=None) -> dict:
+        """
+        Apply a request of ``mvserve`` with the same semantics as
+        ``modify_multi_items`` and without confirmation.
+
+        The request holds the CLI ``args`` and the optional ``album``, ``write``,
+        ``move``, ``inherit``, ``lazy`` and ``pretend`` flags.
+        """
+        if not isinstance(request, dict):
+            raise UserError("the request must be a JSON object")
+        args = request.get("args", [])
+        if not isinstance(args, list) or not all(isinstance(arg, str) for arg in args):
+            raise UserError("'args' must be a list of strings")
+
+        query, mods, dels, adds, removes = self.parse_args(args, prefixes)
+        changes = self.compute_changes(
+            lib,
+            query,
+            mods,
+            dels,
+            adds,
+            removes,
+            request.get("album", False),
+            request.get("lazy", False),
+        )
+        if not request.get("pretend", False):
+            self.apply_changes(
+                lib,
+                changes,
+                ui.should_write(request.get("write")),
+                ui.should_move(request.get("move")),
+                request.get("inherit", True),
+            )
+
+        return {
+            "changes": [
+                {"id": change.obj.id, "mods": change.mods, "dels": change.dels}
+                for change in changes
+            ]
+        }
+
+    def serve(self, lib, opts, args):
+        """CLI entry"""
+        path = self.get_socket_path(opts.socket)
+        server = self.get_server(lib, path)
+        self._log.info("listening on {}", path)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            os.remove(path)
+
+    ##
+    # Export/Import
+    ##
+
+    def get_export_command(self) -> Subcommand:
+        export_command = LazySubcommand(
+            "mvexport",
+            self.setup_export_parser,
+            help="export multi-value fields as JSON lines",
+        )
+        export_command.func = self.export
+        return export_command
+
+    def setup_export_parser(self, parser):
+        parser.usage += (
+            "\nExample: %prog artists,grouping genres:Rock > values.jsonl"
+        )
+        parser.add_album_option()
+
+    def get_import_command(self) -> Subcommand:
+        import_command = LazySubcommand(
+            "mvimport",
+            self.setup_import_parser,
+            help="import multi-value fields from JSON lines",
+        )
+        import_command.func = self.import_
+        return import_command
+
+    def setup_import_parser(self, parser):
+        parser.usage += "\nExample: %prog values.jsonl"
+        parser.add_option(
+            "-w",
+            "--write",
+            action="store_true",
+            default=None,
+            help="write new metadata to files' tags (default)",
+        )
+        parser.add_option(
+            "-W",
+            "--nowrite",
+            action="store_false",
+            dest="write",
+            help="don't write metadata (opposite of -w)",
+        )
+        parser.add_album_option()
+        parser.add_option(
+            "-p",
+            "--pretend",
+            action="store_true",
+            help="show the changes without applying them",
+        )
+        parser.add_option(
+            "-b",
+            "--batch-size",
+            type="int",
+            default=1000,
+            help="number of objects stored per transaction",
+        )
+        parser.add_option(
+            "-j",
+            "--jobs",
+            type="int",
+            default=1,
+            help="number of files written in parallel",
+        )
+
+    def split_multivalue(self, field: str, value) -> list[str]:
+        if field in self.string_multivalue_fields:
+            separator = self.string_multivalue_fields[field]
+            return value.split(separator) if value else []
+        return list(value or [])
+
+    def join_multivalue(self, model_cls, field: str, values: list[str]):
+        if field in self.string_multivalue_fields:
+            return model_cls._parse(
+                field, self.string_multivalue_fields[field].join(values)
+            )
+        return list(values)
+
+    def export_values(self, lib, fields: list[str], query, album) -> Iterable[dict]:
+        """
+        Yield the id and the values of ``fields`` of each object matching ``query``.
+        The objects are read by batches, so the memory does not grow with the
+        library.
+        """
+        self.check_multivalue_fields(fields)
+        model_cls = library.Album if album else library.Item
+        query_obj, sort = self.parse_query(query, model_cls)
+        ids_clause = self.get_ids_sql(model_cls, query_obj)
+        if ids_clause is None or set(fields) & set(model_cls._getters()):
+            # The objects of the results are only built when iterated
+            objs: Iterable = (lib.albums if album else lib.items)(query_obj, sort)
+        else:
+            objs = self.iter_projected_objects(lib, model_cls, *ids_clause, set(fields))
+
+        found = False
+        for obj in objs:
+            found = True
+            values = {"id": obj.id}
+            for field in fields:
+                values[field] = self.split_multivalue(field, obj.get(field))
+            yield values
+
+        if not found:
+            raise UserError(
+                "No matching {}s found.".format("album" if album else "item")
+            )
+
+    def iter_projected_objects(
+        self, lib, model_cls, ids_sql: str, subvals, fields: set[str]
+    ) -> Iterable:
+        """
+        Objects whose id is returned by ``ids_sql`` holding only ``fields``, in id
+        order. They are fetched by batches of ``FETCH_BATCH_SIZE``.
+        """
+        last_id = -1
+        while True:
+            batch_sql = (
+                f"SELECT id FROM ({ids_sql}) WHERE id > ? "
+                f"ORDER BY id LIMIT {FETCH_BATCH_SIZE}"
+            )
+            objs = self.fetch_fields(
+                lib, model_cls, batch_sql, [*subvals, last_id], fields, "id"
+            )
+            yield from objs
+            if len(objs) < FETCH_BATCH_SIZE:
+                return
+            last_id = objs[-1].id
+
+    def compute_import_changes(self, lib, lines: Iterable, album) -> list[ObjectChange]:
+        """
+        Diff the values of the JSON ``lines`` against the current ones. Only the
+        objects with a different value are returned. The whole file is validated
+        here, so that nothing is stored from an invalid one.
+        """
+        import json
+
+        model_cls = library.Album if album else library.Item
+        changes = []
+        for number, line in enumerate(lines, 1):
+            if not line.strip():
+                continue
+            try:
+                values = json.loads(line)
+            except ValueError:
+                values = None
+            if not isinstance(values, dict) or "id" not in values:
+                raise UserError(f"line {number}: expected an object with an 'id'")
+            obj_id = values.pop("id")
+            self.check_multivalue_fields(values)
+            for field, field_values in values.items():
+                if not isinstance(field_values, list) or not all(
+                    isinstance(value, str) for value in field_values
+                ):
+                    raise UserError(
+                        f"line {number}: '{field}' is not a list of strings"
+                    )
+
+            obj = lib.get_album(obj_id) if album else lib.get_item(obj_id)
+            if obj is None:
+                self._log.warning("line {}: no object with id {}", number, obj_id)
+                continue
+
+            mods = {}
+            for field, field_values in values.items():
+                new_value = self.join_multivalue(model_cls, field, field_values)
+                if new_value != obj.get(field):
+                    mods[field] = new_value
+
+            if mods:
+                original = obj.copy()
+                self.apply_modifications(obj, mods, [])
+                changes.append(ObjectChange(obj, original, mods, [], False))
+
+        return changes
+
+    def write_objects(self, lib, objs: Iterable, jobs: int = 1):
+        """
+        Write the tags of ``objs`` (or of their items for albums) to their files and
+        store the new modification time of the written ones.
+        """
+        items: list[library.Item] = []
+        for obj in objs:
+            items += obj.items() if isinstance(obj, library.Album) else [obj]
+
+        if jobs > 1:
+            from concurrent.futures import ThreadPoolExecutor
+
+            with ThreadPoolExecutor(max_workers=jobs) as pool:
+                written = list(pool.map(lambda item: item.try_write(), items))
+        else:
+            written = [item.try_write() for item in items]
+
+        # Stored from this thread, as each thread has its own database connection
+        with lib.transaction():
+            for item, success in zip(items, written):
+                if success:
+                    item.store(["mtime"])
+
+    def export(self, lib, opts, args):
+        """CLI entry"""
+        import json
+
+        if not args:
+            raise UserError("no fields to export")
+        fields = args[0].split(",")
+        for values in self.export_values(lib, fields, args[1:], opts.album):
+            print_(json.dumps(values, ensure_ascii=False))
+
+    def import_(self, lib, opts, args):
+        """CLI entry"""
+        if len(args) != 1:
+            raise UserError("a single file to import is expected")
+
+        with open(args[0], encoding="utf-8") as f:
+            changes = self.compute_import_changes(lib, f, opts.album)
+
+        if opts.pretend:
+            for change in changes:
+                self.show_change(change)
+            return
+
+        self.apply_changes(lib, changes, batch_size=opts.batch_size)
+        if ui.should_write(opts.write):
+            self.write_objects(lib, (change.obj for change in changes), opts.jobs)
+        print_(
+            "Modified {} {}s.".format(len(changes), "album" if opts.album else "item")
         )
 
     ##
@@ -414,6 +1802,9 @@ class MultiValuePlugin(BeetsPlugin):
             self.fix_grouping_work_field()
 
     def fix_grouping_work_field(self):
+        # Still patched when the plugin is loaded, before any file is read
+        import mediafile
+
         grouping_field = mediafile.MediaField(
             mediafile.MP3StorageStyle("GRP1"),
             mediafile.MP4StorageStyle("\xa9grp"),
@@ -0,0 +1,127 @@
+"""
+Measure the startup cost added by the plugin to ``beet --help`` and ``beet ls``.
+
+Each command is run in a new process with and without the plugin enabled, on an
+empty library. The best wall time of the runs is kept and the modules only
+imported with the plugin are listed with their import time (``-X importtime``).
+As the wall time is noisy, the time spent loading the plugins and creating their
+commands is also measured alone, the way ``beet`` does it for any command.
+
+    python benchmarks/startup.py [--runs 20]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+COMMANDS = (["--help"], ["ls"])
+
+LOAD_PLUGINS = """
+import time
+import beets.library
+import beets.ui
+import beets.ui.commands
+from beets import config, plugins
+
+config.read()
+start = time.perf_counter()
+plugins.load_plugins()
+plugins.commands()
+print(time.perf_counter() - start)
+"""
+
+
+def write_config(directory: str, plugins: list[str]) -> str:
+    config_dir = os.path.join(directory, "-".join(plugins) or "none")
+    os.makedirs(config_dir, exist_ok=True)
+    with open(os.path.join(config_dir, "config.yaml"), "w") as f:
+        f.write(f"directory: {directory}\n")
+        f.write(f"library: {os.path.join(directory, 'library.db')}\n")
+        f.write(f"plugins: [{', '.join(plugins)}]\n")
+    return config_dir
+
+
+def run(config_dir: str, args: list[str], importtime=False) -> tuple[float, str]:
+    env = dict(os.environ, BEETSDIR=config_dir)
+    options = ["-X", "importtime"] if importtime else []
+    start = time.perf_counter()
+    process = subprocess.run(
+        [sys.executable, *options, "-m", "beets", *args],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return time.perf_counter() - start, process.stderr
+
+
+def load_plugins(config_dir: str) -> float:
+    env = dict(os.environ, BEETSDIR=config_dir)
+    process = subprocess.run(
+        [sys.executable, "-c", LOAD_PLUGINS],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return float(process.stdout)
+
+
+def get_import_times(stderr: str) -> dict[str, int]:
+    """
+    Self import time in microseconds by module name.
+    """
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_time, _, name = line[len("import time:") :].split("|")
+        times[name.strip()] = int(self_time)
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=20)
+    options = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        configs = {
+            "without": write_config(directory, []),
+            "with": write_config(directory, ["multivalue"]),
+        }
+        load_time = min(load_plugins(configs["with"]) for _ in range(options.runs))
+        print(f"Loading the plugin and its commands: {load_time * 1000:.2f} ms")
+
+        for args in COMMANDS:
+            # Warm up the bytecode caches
+            for config_dir in configs.values():
+                run(config_dir, args)
+
+            best = {
+                name: min(run(config_dir, args)[0] for _ in range(options.runs))
+                for name, config_dir in configs.items()
+            }
+            print(
+                f"beet {' '.join(args)}: {best['without'] * 1000:.1f} ms without, "
+                f"{best['with'] * 1000:.1f} ms with the plugin "
+                f"(+{(best['with'] - best['without']) * 1000:.1f} ms)"
+            )
+
+            without = get_import_times(run(configs["without"], args, True)[1])
+            with_plugin = get_import_times(run(configs["with"], args, True)[1])
+            added = {
+                name: self_time
+                for name, self_time in with_plugin.items()
+                if name not in without
+            }
+            print(f"  {sum(added.values()) / 1000:.1f} ms importing:")
+            for name, self_time in sorted(added.items(), key=lambda i: -i[1]):
+                print(f"    {self_time / 1000:6.2f} ms {name}")
+
+
+if __name__ == "__main__":
+    main()
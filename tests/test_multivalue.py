@@ -1,10 +1,28 @@
+import json
+import os
+import socket
+import threading
+import time
+from contextlib import redirect_stdout
+from io import StringIO
+from unittest.mock import patch
+
 import beets
 import pytest
 from beets.test.helper import PluginTestCase
 from parameterized import parameterized
 
+from beetsplug.multivalue import cached_value_match, run_shard, shard_worker
+
+
+class MultiValuePluginMixin:
+    def get_plugin(self):
+        return next(
+            p for p in beets.plugins.find_plugins() if p.name == "multivalue"
+        )
 
-class MultiValueModifyCliTest(PluginTestCase):
+
+class MultiValueModifyCliTest(MultiValuePluginMixin, PluginTestCase):
     plugin = "multivalue"
 
     def enable_string_field(self, sep=","):
@@ -222,6 +240,25 @@ class MultiValueModifyCliTest(PluginTestCase):
 
         assert getattr(item, field_name) == expected_value
 
+    def test_prefixes_resolved_once(self):
+        self.add_item(artists=["Eric"])
+        with patch(
+            "beetsplug.multivalue.MultiValuePlugin.get_prefixes",
+            return_value={"~": beets.dbcore.query.StringQuery},
+        ) as get_prefixes:
+            self.run_command(
+                "multimodify", "-y", "artists+=Jamel", "artists-=~eric", "artists+=Max"
+            )
+        assert get_prefixes.call_count == 1
+
+    def test_value_match_memoized(self):
+        self.add_item(artists=["Éric"])
+        self.add_item(artists=["Éric", "Max"])
+        cached_value_match.cache_clear()
+        self.run_command("multimodify", "-y", "artists-=~Jamel")
+        assert cached_value_match.cache_info().misses == 2
+        assert cached_value_match.cache_info().hits == 1
+
     @parameterized.expand(
         [
             # comma_separator
@@ -258,6 +295,403 @@ class MultiValueModifyCliTest(PluginTestCase):
         item.load()
         assert item.artists == ["Eric"]
 
+    ###
+    # Lazy loading
+    ###
+
+    @parameterized.expand(
+        [
+            ("list", "artists", ["Eric"], "artists+=Jamel", ["Eric", "Jamel"]),
+            ("list", "artists", ["Eric", "Jamel"], "artists-=~jamel", ["Eric"]),
+            ("string", "grouping", "Classic", "grouping+=Rock", "Classic,Rock"),
+            ("string", "grouping", "Rock,Classic", "grouping-=:R.+", "Classic"),
+            ("string", "grouping", "Rock", "grouping=$title", "Song"),
+            ("string", "grouping", "Rock", "grouping+=%upper{$title}", "Rock,SONG"),
+            ("string", "grouping", "Rock", "grouping+=$mood", "Rock,calm"),
+            ("string", "grouping", "Rock", "grouping!", ""),
+        ]
+    )
+    def test_lazy_operations(
+        self, field_type, field_name, initial_value, command, expected_value
+    ):
+        if field_type == "string":
+            self.enable_string_field()
+        item = self.add_item(**{field_name: initial_value}, title="Song", mood="calm")
+
+        self.run_command("multimodify", "-y", "-l", command, "title:Song")
+        item.load()
+
+        assert getattr(item, field_name) == expected_value
+        assert item.title == "Song"
+        assert item.mood == "calm"
+
+    def test_lazy_album(self):
+        album = self.add_album(albumartists=["Eric"])
+        self.run_command("multimodify", "-y", "-l", "-a", "albumartists+=Jamel")
+        album.load()
+        assert album.albumartists == ["Eric", "Jamel"]
+        assert album.items()[0].albumartists == ["Eric", "Jamel"]
+
+    def test_lazy_no_matching_items(self):
+        with pytest.raises(beets.ui.UserError, match=r"No matching items found\."):
+            self.run_command("multimodify", "-y", "-l", "title:nothing", "title=Test")
+
+    def test_projected_query_loads_needed_fields(self):
+        self.enable_string_field()
+        self.add_item(grouping="Rock", title="Song", mood="calm", energy="high")
+        objs = self.get_plugin().do_projected_query(
+            self.lib, ["title:Song"], False, {"grouping", "mood"}
+        )
+
+        assert len(objs) == 1
+        assert objs[0]._values_fixed.keys() == ["album_id", "grouping", "id"]
+        assert objs[0]._values_flex.keys() == ["mood"]
+
+    @parameterized.expand(
+        [
+            # Computed field
+            (["title:Song"], {"singleton"}),
+            # Slow query
+            (["mood::c.lm"], {"grouping"}),
+        ]
+    )
+    def test_projected_query_fallback(self, query, fields):
+        self.add_item(title="Song", mood="calm")
+        plugin = self.get_plugin()
+        assert plugin.do_projected_query(self.lib, query, False, fields) is None
+
+    def test_template_fields_unknown_function(self):
+        plugin = self.get_plugin()
+        template = beets.util.functemplate.template("%aunique{}")
+        assert plugin.get_template_fields([template]) is None
+
+    ###
+    # Batch API
+    ###
+
+    def test_api_compute_changes(self):
+        self.enable_string_field()
+        item1 = self.add_item(artists=["Eric"], grouping="Rock")
+        item2 = self.add_item(artists=["Eric", "Jamel"], grouping="Rock")
+        self.add_item(artists=["Max"], grouping="Rock")
+
+        changes = self.get_plugin().compute_changes(
+            self.lib,
+            "artists:Eric",
+            mods={"title": "New"},
+            adds=[("artists", "Jamel", beets.dbcore.query.MatchQuery)],
+            removes=[("grouping", "rock", beets.dbcore.query.StringQuery)],
+        )
+
+        assert [change.obj.id for change in changes] == [item1.id, item2.id]
+        assert changes[0].mods == {
+            "title": "New",
+            "artists": ["Eric", "Jamel"],
+            "grouping": "",
+        }
+        assert changes[1].mods["artists"] == ["Eric", "Jamel"]
+        # Nothing stored yet
+        item1.load()
+        assert item1.artists == ["Eric"]
+
+    def test_api_compute_unchanged(self):
+        self.add_item(artists=["Eric"])
+        changes = self.get_plugin().compute_changes(
+            self.lib, adds=[("artists", "Eric", beets.dbcore.query.MatchQuery)]
+        )
+        assert changes == []
+
+    def test_api_compute_invalid_operation(self):
+        self.add_item(artists=["Eric"])
+        with pytest.raises(
+            beets.ui.UserError, match=r"Regex is not supported when adding a value"
+        ):
+            self.get_plugin().compute_changes(
+                self.lib, adds=[("artists", "E.*", beets.dbcore.query.RegexpQuery)]
+            )
+
+    @parameterized.expand([(None,), (1,), (2,)])
+    def test_api_apply_changes(self, batch_size):
+        items = [self.add_item(artists=["Eric"]) for _ in range(3)]
+        plugin = self.get_plugin()
+        changes = plugin.compute_changes(
+            self.lib,
+            removes=[("artists", "eric", beets.dbcore.query.StringQuery)],
+            lazy=True,
+        )
+        plugin.apply_changes(self.lib, changes, batch_size=batch_size)
+
+        for item in items:
+            item.load()
+            assert item.artists == []
+
+    def test_api_apply_checked_changes(self):
+        item1 = self.add_item(artists=["Eric"], title="Song")
+        item2 = self.add_item(artists=["Eric"], title="Song")
+        plugin = self.get_plugin()
+        adds = [("artists", "Jamel", beets.dbcore.query.MatchQuery)]
+        changes = plugin.compute_changes(self.lib, adds=adds)
+
+        # Modified by another process meanwhile
+        concurrent = self.lib.get_item(item2.id)
+        concurrent.artists = ["Max"]
+        concurrent.store()
+
+        conflicts = plugin.apply_changes(self.lib, changes, check=True)
+        assert [change.obj.id for change in conflicts] == [item2.id]
+        item1.load()
+        item2.load()
+        assert item1.artists == ["Eric", "Jamel"]
+        assert item2.artists == ["Max"]
+
+        # Retried with the new values
+        conflicts = plugin.apply_optimistic_changes(
+            self.lib, conflicts, [], {}, [], adds, [], False, False, False, True
+        )
+        assert conflicts == []
+        item2.load()
+        assert item2.artists == ["Max", "Jamel"]
+
+    @parameterized.expand([(False,), (True,)])
+    def test_api_checked_changes_read_fields(self, lazy):
+        self.enable_string_field()
+        item = self.add_item(grouping="Rock", title="Old")
+        plugin = self.get_plugin()
+        adds = [("grouping", "$title", beets.dbcore.query.MatchQuery)]
+        changes = plugin.compute_changes(self.lib, adds=adds, lazy=lazy)
+        assert changes[0].read == {"title"}
+
+        # The value the new one is computed from changed meanwhile
+        concurrent = self.lib.get_item(item.id)
+        concurrent.title = "New"
+        concurrent.store()
+
+        conflicts = plugin.apply_changes(self.lib, changes, check=True)
+        assert [change.obj.id for change in conflicts] == [item.id]
+        item.load()
+        assert item.grouping == "Rock"
+
+    def test_api_checked_changes_query_fields(self):
+        self.enable_string_field()
+        item = self.add_item(grouping="Rock", year=2000)
+        plugin = self.get_plugin()
+        adds = [("grouping", "Kid", beets.dbcore.query.MatchQuery)]
+        changes = plugin.compute_changes(self.lib, "year:2000", adds=adds, lazy=True)
+        assert changes[0].read == {"year"}
+        assert changes[0].original.year == 2000
+
+        # Does not match the query anymore
+        concurrent = self.lib.get_item(item.id)
+        concurrent.year = 2001
+        concurrent.store()
+
+        conflicts = plugin.apply_changes(self.lib, changes, check=True)
+        assert [change.obj.id for change in conflicts] == [item.id]
+        item.load()
+        assert item.grouping == "Rock"
+
+    def test_api_checked_changes_unknown_read_fields(self):
+        item = self.add_item(artists=["Eric"], year=2000)
+        plugin = self.get_plugin()
+        adds = [("artists", "%ifdef{title,Jamel}", beets.dbcore.query.MatchQuery)]
+        changes = plugin.compute_changes(self.lib, adds=adds)
+        assert changes[0].read is None
+
+        # Any field may have been read
+        concurrent = self.lib.get_item(item.id)
+        concurrent.year = 2001
+        concurrent.store()
+
+        conflicts = plugin.apply_changes(self.lib, changes, check=True)
+        assert len(conflicts) == 1
+
+    def test_api_optimistic_retry_confirmed(self):
+        item = self.add_item(artists=["Eric"])
+        plugin = self.get_plugin()
+        adds = [("artists", "Jamel", beets.dbcore.query.MatchQuery)]
+        changes = plugin.compute_changes(self.lib, adds=adds)
+
+        concurrent = self.lib.get_item(item.id)
+        concurrent.artists = ["Max"]
+        concurrent.store()
+
+        with patch("beets.ui.input_select_objects", return_value=[]) as select:
+            conflicts = plugin.apply_optimistic_changes(
+                self.lib,
+                changes,
+                [],
+                {},
+                [],
+                adds,
+                [],
+                False,
+                False,
+                False,
+                True,
+                confirm=True,
+            )
+        assert conflicts == []
+        assert [change.mods for change in select.call_args.args[1]] == [
+            {"artists": ["Max", "Jamel"]}
+        ]
+        item.load()
+        assert item.artists == ["Max"]
+
+    def test_optimistic(self):
+        items = [self.add_item(artists=["Eric"]) for _ in range(3)]
+        self.run_command("multimodify", "-y", "-O", "artists+=Jamel")
+        for item in items:
+            item.load()
+            assert item.artists == ["Eric", "Jamel"]
+
+    def test_bulk_engines(self):
+        plugin = self.get_plugin()
+        adds = [("Rock", beets.dbcore.query.MatchQuery)]
+        removes = [("pop", beets.dbcore.query.StringQuery)]
+
+        assert plugin.update_string_multivalues(
+            ["Pop", "Pop", "Rock", ""], None, adds, removes, ","
+        ) == ["Rock", "Rock", "Rock", "Rock"]
+
+        new_values = plugin.update_list_multivalues(
+            [["Pop"], ["Pop"], ["Jazz"]], None, adds, removes
+        )
+        assert new_values == [["Rock"], ["Rock"], ["Jazz", "Rock"]]
+        assert new_values[0] is not new_values[1]
+
+    ###
+    # Export/Import
+    ###
+
+    def run_with_output(self, *args):
+        with redirect_stdout(StringIO()) as output:
+            self.run_command(*args)
+        return output.getvalue()
+
+    def write_import_file(self, lines):
+        path = os.path.join(os.fsdecode(self.temp_dir), "values.jsonl")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\n".join(json.dumps(line) for line in lines))
+        return path
+
+    def test_export(self):
+        self.enable_string_field()
+        item1 = self.add_item(artists=["Éric", "Jamel"], grouping="Rock,Pop")
+        item2 = self.add_item(artists=[], grouping="", title="Other")
+
+        output = self.run_with_output("mvexport", "artists,grouping", "^title:Other")
+        assert [json.loads(line) for line in output.splitlines()] == [
+            {"id": item1.id, "artists": ["Éric", "Jamel"], "grouping": ["Rock", "Pop"]}
+        ]
+
+        output = self.run_with_output("mvexport", "grouping", f"id:{item2.id}")
+        assert json.loads(output) == {"id": item2.id, "grouping": []}
+
+    @patch("beetsplug.multivalue.FETCH_BATCH_SIZE", 2)
+    def test_export_batches(self):
+        self.enable_string_field()
+        items = [self.add_item(grouping=f"Rock,{i}") for i in range(5)]
+
+        output = self.run_with_output("mvexport", "grouping", "grouping:Rock")
+        assert [json.loads(line) for line in output.splitlines()] == [
+            {"id": item.id, "grouping": ["Rock", str(i)]}
+            for i, item in enumerate(items)
+        ]
+
+        # Regex on a flexible field can not run in SQL
+        output = self.run_with_output("mvexport", "grouping", "grouping::^Rock,[13]$")
+        assert [json.loads(line)["id"] for line in output.splitlines()] == [
+            items[1].id,
+            items[3].id,
+        ]
+
+    def test_export_undeclared_field(self):
+        with pytest.raises(
+            beets.ui.UserError, match=r"'grouping' is not a declared multivalue field"
+        ):
+            self.run_command("mvexport", "grouping")
+
+    def test_import(self):
+        self.enable_string_field()
+        item1 = self.add_item(artists=["Eric"], grouping="Rock")
+        item2 = self.add_item(artists=["Max"], grouping="Pop")
+        path = self.write_import_file(
+            [
+                {"id": item1.id, "artists": ["Eric", "Jamel"], "grouping": ["Rock"]},
+                {"id": item2.id, "artists": ["Max"], "grouping": ["Pop", "Jazz"]},
+                {"id": 1000, "artists": []},
+            ]
+        )
+
+        plugin = self.get_plugin()
+        with open(path, encoding="utf-8") as f:
+            changes = plugin.compute_import_changes(self.lib, f, False)
+        assert [change.mods for change in changes] == [
+            {"artists": ["Eric", "Jamel"]},
+            {"grouping": "Pop,Jazz"},
+        ]
+
+        output = self.run_with_output("mvimport", "-W", "-b", "1", path)
+        assert "Modified 2 items." in output
+        item1.load()
+        item2.load()
+        assert item1.artists == ["Eric", "Jamel"]
+        assert item2.grouping == "Pop,Jazz"
+
+    def test_import_write_stores_mtime(self):
+        item = self.add_item(artists=["Eric"], mtime=1)
+        path = self.write_import_file([{"id": item.id, "artists": ["Eric", "Jamel"]}])
+
+        def write(item, *args, **kwargs):
+            # Like Item.write without a real file
+            item.mtime = 1000
+
+        with patch.object(beets.library.Item, "write", autospec=True, side_effect=write):
+            self.run_command("mvimport", "-w", "-j", "2", path)
+
+        item = self.lib.get_item(item.id)
+        assert item.artists == ["Eric", "Jamel"]
+        assert item.mtime == 1000
+
+    @parameterized.expand(
+        [
+            ("Jamel", r"line 2: 'artists' is not a list of strings"),
+            ([1, None], r"line 2: 'artists' is not a list of strings"),
+        ]
+    )
+    def test_import_invalid_value(self, value, error):
+        item = self.add_item(artists=["Eric"])
+        path = self.write_import_file(
+            [
+                {"id": item.id, "artists": ["Jamel"]},
+                {"id": item.id, "artists": value},
+            ]
+        )
+        with pytest.raises(beets.ui.UserError, match=error):
+            self.run_command("mvimport", "-W", "-b", "1", path)
+
+        # Nothing stored from the valid lines
+        item.load()
+        assert item.artists == ["Eric"]
+
+    def test_import_invalid_line(self):
+        path = self.write_import_file([[1, 2]])
+        with pytest.raises(
+            beets.ui.UserError, match=r"line 1: expected an object with an 'id'"
+        ):
+            self.run_command("mvimport", path)
+
+    ###
+    # Command
+    ###
+
+    def test_lazy_command_options(self):
+        command = self.get_plugin().get_command()
+        assert command._parser.get_option("--lazy") is None
+
+        assert command.parser.get_option("--lazy") is not None
+        assert "Examples:" in command.parser.usage
+
     ###
     # Compatibility with standard modify command
     ###
@@ -371,6 +805,46 @@ class MultiValueModifyCliTest(PluginTestCase):
         assert item.year == 0
         assert item.grouping == "Rock,Pop,Jazz"
 
+    ###
+    # Diff
+    ###
+
+    def test_diff_string_elements(self):
+        self.enable_string_field()
+        self.add_item(grouping="Hard Rock,Classic Rock,Rock", title="Song")
+
+        output = self.run_with_output(
+            "multimodify", "-y", "grouping-=Classic Rock", "grouping+=OST"
+        )
+        assert "grouping:\n    - Classic Rock\n    + OST\n" in output
+        assert "Hard Rock" not in output
+
+    def test_diff_list_elements_with_other_fields(self):
+        self.add_item(artists=["Eric", "Jamel"], title="Song")
+
+        output = self.run_with_output(
+            "multimodify",
+            "-y",
+            "-W",
+            "-M",
+            "artists-=Eric",
+            "artists+=John",
+            "title=New",
+        )
+        assert "title: Song -> New" in output
+        assert "artists:\n    - Eric\n    + John\n" in output
+
+    def test_diff_order_only(self):
+        self.enable_string_field()
+        item = self.add_item(grouping="Rock,Pop")
+
+        plugin = self.get_plugin()
+        assert plugin.get_multivalue_diff("grouping", "Rock,Pop", "Rock,Pop") is None
+        assert (
+            plugin.get_multivalue_diff("grouping", item.grouping, "Pop,Rock")
+            == "grouping: Rock; Pop -> Pop; Rock"
+        )
+
     @parameterized.expand(
         [
             # write_nomove_options
@@ -401,3 +875,256 @@ class MultiValueModifyCliTest(PluginTestCase):
 
         with pytest.raises(beets.ui.UserError, match=r"No matching items found\."):
             self.run_command("multimodify", "-y", "nonexistent:query", "title=Test")
+
+
+def run_shard_then_edit_title(id_range):
+    """
+    Compute a shard, then change the titles the new values were computed from,
+    as another process would do before the changes are applied.
+    """
+    results = run_shard(id_range)
+    lib = shard_worker["lib"]
+    for obj_id, *_ in results:
+        item = lib.get_item(obj_id)
+        item.title = f"New {obj_id}"
+        item.store()
+    return results
+
+
+class MultiValueWorkersTest(MultiValuePluginMixin, PluginTestCase):
+    plugin = "multivalue"
+    # Shared with the worker processes
+    db_on_disk = True
+
+    def test_workers(self):
+        self.config["multivalue"]["string_fields"] = {"grouping": ","}
+        items = [
+            self.add_item(artists=["Eric"], grouping="Rock", title=f"Song {i}")
+            for i in range(10)
+        ]
+        items.append(self.add_item(artists=["Max"], grouping="Rock,Pop"))
+
+        self.run_command(
+            "multimodify",
+            "-y",
+            "-j",
+            "3",
+            "artists+=Jamel",
+            "grouping+=%upper{$title}",
+            "artists:Eric",
+        )
+
+        for i, item in enumerate(items[:10]):
+            item.load()
+            assert item.artists == ["Eric", "Jamel"]
+            assert item.grouping == f"Rock,SONG {i}"
+        items[10].load()
+        assert items[10].artists == ["Max"]
+        assert items[10].grouping == "Rock,Pop"
+
+    @patch("beetsplug.multivalue.run_shard", new=run_shard_then_edit_title)
+    def test_workers_values_changed_meanwhile(self):
+        self.config["multivalue"]["string_fields"] = {"grouping": ","}
+        items = [
+            self.add_item(grouping="Rock", title=f"Song {i}", year=2000)
+            for i in range(4)
+        ]
+
+        self.run_command(
+            "multimodify",
+            "-y",
+            "-W",
+            "-M",
+            "-j",
+            "2",
+            "grouping+=%upper{$title}",
+            "year:2000",
+        )
+
+        for item in items:
+            item.load()
+            assert item.title == f"New {item.id}"
+            assert item.grouping == f"Rock,NEW {item.id}"
+
+    def test_compute_shard(self):
+        items = [self.add_item(artists=["Eric"]) for _ in range(4)]
+        plugin = self.get_plugin()
+        adds = [("artists", "Jamel", beets.dbcore.query.MatchQuery)]
+
+        assert plugin.get_matching_ids(self.lib, [], False) == [i.id for i in items]
+        results = plugin.compute_shard(
+            self.lib, (items[1].id, items[2].id), [], False, {}, [], adds, []
+        )
+        assert results == [
+            (
+                item.id,
+                {"artists": ["Eric", "Jamel"]},
+                {"id": item.id, "artists": ["Eric"]},
+            )
+            for item in items[1:3]
+        ]
+
+    def test_compute_shard_slow_query(self):
+        self.config["multivalue"]["string_fields"] = {"grouping": ","}
+        items = [self.add_item(grouping="Rock", mood=f"calm {i}") for i in range(6)]
+        plugin = self.get_plugin()
+        adds = [("grouping", "Kid", beets.dbcore.query.MatchQuery)]
+        regexp_match = beets.dbcore.query.RegexpQuery.match
+
+        # Regex on a flexible field can not run in SQL
+        with patch.object(
+            beets.dbcore.query.RegexpQuery,
+            "match",
+            autospec=True,
+            side_effect=regexp_match,
+        ) as match:
+            results = plugin.compute_shard(
+                self.lib,
+                (items[1].id, items[3].id),
+                ["mood::^calm [0-2]$"],
+                False,
+                {},
+                [],
+                adds,
+                [],
+            )
+        assert results == [
+            (
+                item.id,
+                {"grouping": "Rock,Kid"},
+                {"grouping": "Rock", "mood": f"calm {i}"},
+            )
+            for i, item in enumerate(items[1:3], 1)
+        ]
+        # Only the objects of the shard are matched
+        assert match.call_count == 3
+
+
+class MultiValueServerTest(MultiValuePluginMixin, PluginTestCase):
+    plugin = "multivalue"
+    # Each connection is served in its own thread with its own database connection
+    db_on_disk = True
+
+    def send_requests(self, requests):
+        """Send ``requests`` to a server answering them in this thread."""
+        path = os.path.join(os.fsdecode(self.temp_dir), "mv.sock")
+        server = self.get_plugin().get_server(self.lib, path)
+        responses = []
+
+        def client():
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.connect(path)
+                stream = sock.makefile("rwb")
+                for request in requests:
+                    stream.write(request.encode() + b"\n")
+                    stream.flush()
+                    responses.append(json.loads(stream.readline()))
+
+        thread = threading.Thread(target=client)
+        thread.start()
+        server.handle_request()
+        thread.join()
+        server.server_close()
+        return responses
+
+    def test_serve_requests(self):
+        item = self.add_item(artists=["Eric"])
+
+        responses = self.send_requests(
+            [
+                json.dumps({"args": ["artists+=Jamel"], "write": False}),
+                json.dumps({"args": ["artists+=:J.+"]}),
+                json.dumps({"args": ["artists-=Eric"], "pretend": True}),
+                "not json",
+                json.dumps(["artists+=Jamel"]),
+                json.dumps({"args": "artists+=Jamel"}),
+            ]
+        )
+
+        assert responses[0] == {
+            "changes": [
+                {"id": item.id, "mods": {"artists": ["Eric", "Jamel"]}, "dels": []}
+            ]
+        }
+        assert responses[1] == {"error": "Regex is not supported when adding a value"}
+        assert responses[2]["changes"][0]["mods"] == {"artists": ["Jamel"]}
+        assert "error" in responses[3]
+        assert responses[4] == {"error": "the request must be a JSON object"}
+        assert responses[5] == {"error": "'args' must be a list of strings"}
+        item.load()
+        assert item.artists == ["Eric", "Jamel"]
+
+    def test_serve_concurrent_clients(self):
+        item = self.add_item(artists=["Eric"])
+        path = os.path.join(os.fsdecode(self.temp_dir), "mv.sock")
+        server = self.get_plugin().get_server(self.lib, path)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.start()
+
+        def request(stream, args):
+            stream.write(json.dumps({"args": args}).encode() + b"\n")
+            stream.flush()
+            return json.loads(stream.readline())
+
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as first:
+                first.connect(path)
+                first_stream = first.makefile("rwb")
+                request(first_stream, ["artists+=Jamel"])
+
+                # Served while the first connection is still open
+                with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as second:
+                    second.settimeout(5)
+                    second.connect(path)
+                    response = request(second.makefile("rwb"), ["artists+=John"])
+                assert response["changes"][0]["mods"] == {
+                    "artists": ["Eric", "Jamel", "John"]
+                }
+        finally:
+            server.shutdown()
+            server.server_close()
+            thread.join()
+
+        item.load()
+        assert item.artists == ["Eric", "Jamel", "John"]
+
+    def test_serve_concurrent_edits(self):
+        item = self.add_item(artists=["Eric"])
+        plugin = self.get_plugin()
+        path = os.path.join(os.fsdecode(self.temp_dir), "mv.sock")
+        server = plugin.get_server(self.lib, path)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.start()
+        compute_changes = plugin.compute_changes
+
+        def slow_compute_changes(*args, **kwargs):
+            # Both requests would read the values before any is stored
+            changes = compute_changes(*args, **kwargs)
+            time.sleep(0.2)
+            return changes
+
+        def client(args):
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.connect(path)
+                stream = sock.makefile("rwb")
+                stream.write(json.dumps({"args": args}).encode() + b"\n")
+                stream.flush()
+                stream.readline()
+
+        clients = [
+            threading.Thread(target=client, args=([value],))
+            for value in ("artists+=Jamel", "artists+=John")
+        ]
+        try:
+            with patch.object(plugin, "compute_changes", slow_compute_changes):
+                for client_thread in clients:
+                    client_thread.start()
+                for client_thread in clients:
+                    client_thread.join()
+        finally:
+            server.shutdown()
+            server.server_close()
+            thread.join()
+
+        item.load()
+        assert sorted(item.artists) == ["Eric", "Jamel", "John"]